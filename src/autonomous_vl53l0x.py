@@ -9,6 +9,10 @@ higher-level controller (e.g., the web teleop server).
 
 Environment variables (optional):
   VL53L0X_ADDR           I2C address (default 0x29)
+  VL53L0X_INT_PIN        BCM pin wired to the sensor's GPIO1 (data-ready) line.
+                         When set, the sensor runs in continuous mode and reads
+                         are interrupt driven instead of polled (default unset)
+  I2C_BUS                I2C bus number used for interrupt reads (default 1)
   AUTO_FWD_SPEED         Forward throttle (0..1, default 0.22)
   AUTO_BACK_SPEED        Reverse throttle magnitude (0..1, default 0.18)
   AUTO_TURN_STEER        Steering magnitude (0..1, default 0.55)
@@ -21,37 +25,69 @@ Environment variables (optional):
 
 Dependencies on the Pi:
   pip3 install adafruit-blinka adafruit-circuitpython-vl53l0x
+  pip3 install smbus2  (only with VL53L0X_INT_PIN)
+  pip3 install numpy
+  pip3 install numba   (optional; compiles the avoidance policy)
   sudo apt install -y python3-rpi.gpio  (Ubuntu)
 """
 
 from __future__ import annotations
 
-import os
-import random
 import time
 from dataclasses import dataclass
-from threading import Event
+from threading import Event, Lock
 
+from env_config import int_any_base, read_env
 from motor_controller import MotorController
 
-
-def _env_float(name: str, default: float) -> float:
-    try:
-        return float(os.environ.get(name, str(default)).strip())
-    except Exception:
-        return default
-
-
-def _env_int(name: str, default: int) -> int:
-    try:
-        return int(os.environ.get(name, str(default)).strip(), 0)
-    except Exception:
-        return default
+# Imported at load, not per runner: a cold numpy import on a Pi Zero can take
+# longer than the teleop deadman, and the runner is built before it beats.
+try:
+    import numpy as np
+except ImportError:  # reported when a runner is created
+    np = None
+
+try:
+    from numba import njit
+except ImportError:  # optional; the policy then runs as plain Python
+    def njit(*_args, **_kwargs):
+        return lambda fn: fn
+
+
+# VL53L0X registers used by the interrupt-driven read path.
+_SYSTEM_INTERRUPT_CONFIG_GPIO = 0x0A
+_SYSTEM_INTERRUPT_CLEAR = 0x0B
+_RESULT_INTERRUPT_STATUS = 0x13  # low 3 bits non-zero once a sample is ready
+_RESULT_RANGE_VAL = 0x14 + 10  # RESULT_RANGE_STATUS + 10, big-endian mm
+
+# If no data-ready edge arrives within this many timing budgets, fall back to
+# a direct read so avoidance never acts on a range more than a few samples old.
+_IRQ_STALE_BUDGETS = 3
+
+
+_ENV = read_env(
+    {
+        "VL53L0X_ADDR": (int_any_base, 0x29),
+        "VL53L0X_INT_PIN": (int, -1),
+        "I2C_BUS": (int, 1),
+        "AUTO_FWD_SPEED": (float, 0.22),
+        "AUTO_BACK_SPEED": (float, 0.18),
+        "AUTO_TURN_STEER": (float, 0.55),
+        "AUTO_CLEAR_MM": (float, 350),
+        "AUTO_NEAR_MM": (float, 220),
+        "AUTO_BACK_S": (float, 0.40),
+        "AUTO_TURN_S_MIN": (float, 0.35),
+        "AUTO_TURN_S_MAX": (float, 0.70),
+        "AUTO_LOOP_HZ": (float, 15.0),
+    }
+)
 
 
 @dataclass(frozen=True)
 class AutoAvoidConfig:
     addr: int = 0x29
+    int_pin: int | None = None
+    i2c_bus: int = 1
     fwd_speed: float = 0.22
     back_speed: float = 0.18
     turn_steer: float = 0.55
@@ -62,24 +98,35 @@ class AutoAvoidConfig:
     turn_s_max: float = 0.70
     loop_hz: float = 15.0
 
-    @staticmethod
-    def from_env() -> "AutoAvoidConfig":
-        return AutoAvoidConfig(
-            addr=_env_int("VL53L0X_ADDR", 0x29),
-            fwd_speed=_env_float("AUTO_FWD_SPEED", 0.22),
-            back_speed=_env_float("AUTO_BACK_SPEED", 0.18),
-            turn_steer=_env_float("AUTO_TURN_STEER", 0.55),
-            clear_mm=int(_env_float("AUTO_CLEAR_MM", 350)),
-            near_mm=int(_env_float("AUTO_NEAR_MM", 220)),
-            back_s=_env_float("AUTO_BACK_S", 0.40),
-            turn_s_min=_env_float("AUTO_TURN_S_MIN", 0.35),
-            turn_s_max=_env_float("AUTO_TURN_S_MAX", 0.70),
-            loop_hz=_env_float("AUTO_LOOP_HZ", 15.0),
+    @classmethod
+    def from_env(cls) -> "AutoAvoidConfig":
+        env = _ENV
+        return cls(
+            addr=env.VL53L0X_ADDR,
+            int_pin=env.VL53L0X_INT_PIN if env.VL53L0X_INT_PIN >= 0 else None,
+            i2c_bus=env.I2C_BUS,
+            fwd_speed=env.AUTO_FWD_SPEED,
+            back_speed=env.AUTO_BACK_SPEED,
+            turn_steer=env.AUTO_TURN_STEER,
+            clear_mm=int(env.AUTO_CLEAR_MM),
+            near_mm=int(env.AUTO_NEAR_MM),
+            back_s=env.AUTO_BACK_S,
+            turn_s_min=env.AUTO_TURN_S_MIN,
+            turn_s_max=env.AUTO_TURN_S_MAX,
+            loop_hz=env.AUTO_LOOP_HZ,
         )
 
 
 class VL53L0XReader:
-    def __init__(self, *, address: int = 0x29):
+    """VL53L0X range reader.
+
+    Without ``int_pin`` every ``read_mm`` performs a blocking single-shot
+    measurement. With ``int_pin`` the sensor ranges continuously and raises
+    GPIO1 (active low) when a sample is ready; the edge handler fetches the
+    result in one I2C transaction and ``read_mm`` just returns the latest value.
+    """
+
+    def __init__(self, *, address: int = 0x29, int_pin: int | None = None, i2c_bus: int = 1):
         try:
             import board
             import busio
@@ -105,8 +152,136 @@ class VL53L0XReader:
         except TypeError:
             self._sensor = adafruit_vl53l0x.VL53L0X(i2c)
 
+        self._address = address
+        self._bus = None
+        self._button = None
+        # The edge callback thread and the read_mm fallback share one set of
+        # prebuilt i2c_msg buffers.
+        self._rdwr_lock = Lock()
+        self._stale_s = 0.0
+        self._sample: tuple[int, float] | None = None  # (mm, monotonic ts)
+        if int_pin is not None:
+            self._start_irq(int_pin, i2c_bus)
+
+    def _start_irq(self, int_pin: int, i2c_bus: int):
+        try:
+            from gpiozero import Button
+            from smbus2 import SMBus, i2c_msg
+        except Exception as exc:
+            raise RuntimeError(
+                "Interrupt-driven VL53L0X reads need smbus2. Install on the Pi:\n"
+                "  pip3 install smbus2\n"
+            ) from exc
+
+        self._bus = SMBus(i2c_bus)
+        self._rdwr = (
+            i2c_msg.write(self._address, [_RESULT_RANGE_VAL]),
+            i2c_msg.read(self._address, 2),
+            i2c_msg.write(self._address, [_SYSTEM_INTERRUPT_CLEAR, 0x01]),
+        )
+
+        try:
+            budget_us = self._sensor.measurement_timing_budget
+        except Exception:
+            budget_us = 33000  # driver default
+        self._stale_s = _IRQ_STALE_BUDGETS * budget_us / 1_000_000
+
+        self._sensor.start_continuous()
+        # New-sample-ready on GPIO1; clear anything latched before we listen.
+        self._bus.write_byte_data(self._address, _SYSTEM_INTERRUPT_CONFIG_GPIO, 0x04)
+        self._bus.write_byte_data(self._address, _SYSTEM_INTERRUPT_CLEAR, 0x01)
+
+        self._button = Button(int_pin, pull_up=True)
+        self._button.when_pressed = self._on_ready
+
+    def _on_ready(self):
+        # Pointer write + 2-byte result read as one combined transaction, then
+        # the interrupt clear on its own: i2c-bcm2835 rejects transfers where
+        # a read is not the last message.
+        write_ptr, read_val, clear = self._rdwr
+        i2c_rdwr = self._bus.i2c_rdwr
+        with self._rdwr_lock:
+            i2c_rdwr(write_ptr, read_val)
+            i2c_rdwr(clear)
+            hi, lo = bytes(read_val)
+        self._sample = ((hi << 8) | lo, time.monotonic())
+
     def read_mm(self) -> int:
-        return int(self._sensor.range)
+        if self._button is None:
+            return int(self._sensor.range)
+
+        sample = self._sample
+        if sample is None or time.monotonic() - sample[1] > self._stale_s:
+            # No edge yet (first measurement still running) or a missed one
+            # (GPIO1 stuck low): read directly, but only once a sample is ready
+            # so a start never acts on a stale or zeroed result register.
+            self._wait_data_ready()
+            self._on_ready()
+            sample = self._sample
+        return sample[0]
+
+    def _wait_data_ready(self):
+        read_byte_data = self._bus.read_byte_data
+        address = self._address
+        deadline = time.monotonic() + self._stale_s
+        while not read_byte_data(address, _RESULT_INTERRUPT_STATUS) & 0x07:
+            if time.monotonic() > deadline:
+                raise TimeoutError("VL53L0X: no range sample ready")
+            time.sleep(0.002)
+
+    def close(self):
+        if self._button is None:
+            return
+        self._button.close()
+        self._button = None
+        try:
+            self._sensor.stop_continuous()
+        finally:
+            self._bus.close()
+
+
+# Avoidance phases. SENSE reads the sensor; the others replay the
+# stop -> back up -> turn -> settle sequence without reading it.
+_PHASE_SENSE = 0
+_PHASE_BACK = 1
+_PHASE_TURN = 2
+_PHASE_SETTLE = 3
+
+_STOP_S = 0.08
+_SETTLE_S = 0.05
+
+# Pre-sampled turn directions/durations per refill of the random ring buffer.
+_RNG_BATCH = 4096
+
+# Heartbeat interval during long sleeps; must stay below the web deadman (0.35 s).
+_HEARTBEAT_S = 0.1
+
+
+@njit(
+    "Tuple((float64, float64, float64, boolean, int64))"
+    "(int64, float64, float64, float64, boolean, float64, float64, float64, float64, float64, float64, float64)",
+    cache=True,
+)
+def decide(phase, mm, near_mm, clear_mm, obstacle, fwd, back, back_s, turn_steer, rand_dir, rand_turn_s, period_s):
+    """One step of the avoidance policy (pure; no I/O).
+
+    Returns (throttle, steering, sleep_s, obstacle, next_phase). A (0, 0)
+    command means "stop". ``mm`` is only used in the SENSE phase and
+    ``rand_dir``/``rand_turn_s`` only in the TURN phase.
+    """
+    if phase == _PHASE_SENSE:
+        if mm <= near_mm:
+            obstacle = True
+        if not obstacle and mm >= clear_mm:
+            # Clear path, drive forward.
+            return fwd, 0.0, period_s, obstacle, _PHASE_SENSE
+        # Obstacle handling: stop, back, turn, retry.
+        return 0.0, 0.0, _STOP_S, obstacle, _PHASE_BACK
+    if phase == _PHASE_BACK:
+        return -back, 0.0, back_s, obstacle, _PHASE_TURN
+    if phase == _PHASE_TURN:
+        return 0.0, rand_dir * turn_steer, rand_turn_s, obstacle, _PHASE_SETTLE
+    return 0.0, 0.0, _SETTLE_S, False, _PHASE_SENSE
 
 
 class AutoAvoidRunner:
@@ -115,9 +290,38 @@ class AutoAvoidRunner:
     def __init__(self, controller: MotorController, *, cfg: AutoAvoidConfig | None = None):
         self._controller = controller
         self._cfg = cfg or AutoAvoidConfig.from_env()
-        self._sensor = VL53L0XReader(address=self._cfg.addr)
+
+        # Before the sensor: a failure here must not leave it in continuous
+        # mode with the data-ready pin claimed.
+        if np is None:
+            raise RuntimeError(
+                "numpy missing. Install on the Pi:\n"
+                "  sudo apt install -y python3-numpy\n"
+            )
+        self._rng = np.random.Generator(np.random.PCG64DXSM())
+        self._refill_random()
+
+        self._sensor = VL53L0XReader(
+            address=self._cfg.addr,
+            int_pin=self._cfg.int_pin,
+            i2c_bus=self._cfg.i2c_bus,
+        )
+
+    def _refill_random(self):
+        cfg = self._cfg
+        # Plain lists: indexing them is cheaper than boxing numpy scalars.
+        self._dirs = self._rng.choice((-1.0, 1.0), size=_RNG_BATCH).tolist()
+        self._turns = self._rng.uniform(cfg.turn_s_min, cfg.turn_s_max, size=_RNG_BATCH).tolist()
+        self._rand_i = 0
 
     def run(self, stop_event: Event, *, heartbeat=None, on_status=None):
+        try:
+            self._run(stop_event, heartbeat=heartbeat, on_status=on_status)
+        finally:
+            # Releases the data-ready pin so the next runner can claim it.
+            self._sensor.close()
+
+    def _run(self, stop_event: Event, *, heartbeat=None, on_status=None):
         cfg = self._cfg
         period_s = 1.0 / max(1.0, cfg.loop_hz)
 
@@ -126,67 +330,93 @@ class AutoAvoidRunner:
                 heartbeat(throttle, steering)
 
         def bounded_sleep(total_s: float):
-            end = time.monotonic() + max(0.0, total_s)
-            while not stop_event.is_set():
+            if total_s <= 0:
+                return
+            if not heartbeat:
+                stop_event.wait(total_s)
+                return
+            # Wake only as often as the caller's deadman needs a beat; a stop
+            # request still interrupts the wait immediately.
+            end = time.monotonic() + total_s
+            remaining = total_s
+            while not stop_event.wait(min(_HEARTBEAT_S, remaining)):
+                beat(0.0, 0.0)
                 remaining = end - time.monotonic()
                 if remaining <= 0:
                     return
-                time.sleep(min(0.05, remaining))
-                beat(0.0, 0.0)
 
         last_mm: int | None = None
         obstacle = False
-
-        self._controller.stop()
+        phase = _PHASE_SENSE
+
+        # Hoisted out of the loop: locals are LOAD_FAST, attributes/globals are not.
+        read_mm = self._sensor.read_mm
+        drive = self._controller.drive_arcade
+        stop = self._controller.stop
+        wait = stop_event.wait
+        is_stopped = stop_event.is_set
+        policy = decide
+        near_mm = float(cfg.near_mm)
+        clear_mm = float(cfg.clear_mm)
+        fwd = cfg.fwd_speed
+        back = cfg.back_speed
+        back_s = cfg.back_s
+        turn_steer = cfg.turn_steer
+        dirs = self._dirs
+        turns = self._turns
+        sense = _PHASE_SENSE
+        turn = _PHASE_TURN
+
+        stop()
         beat(0.0, 0.0)
 
-        while not stop_event.is_set():
-            try:
-                mm = self._sensor.read_mm()
-                last_mm = mm
-            except Exception:
-                # If the sensor read fails momentarily, stop for safety.
-                self._controller.stop()
-                if on_status:
-                    on_status({"mm": last_mm, "state": "sensor_error"})
-                bounded_sleep(0.2)
-                continue
-
-            if on_status:
-                on_status({"mm": mm, "state": "forward" if not obstacle else "avoid"})
-
-            if mm <= cfg.near_mm:
-                obstacle = True
-
-            if not obstacle and mm >= cfg.clear_mm:
-                # Clear path, drive forward.
-                self._controller.drive_arcade(cfg.fwd_speed, 0.0)
-                beat(cfg.fwd_speed, 0.0)
-                time.sleep(period_s)
-                continue
-
-            # Obstacle handling: stop, back, turn, retry.
-            self._controller.stop()
-            beat(0.0, 0.0)
-            bounded_sleep(0.08)
-
-            # Back up
-            self._controller.drive_arcade(-cfg.back_speed, 0.0)
-            beat(-cfg.back_speed, 0.0)
-            bounded_sleep(cfg.back_s)
-
-            # Turn left or right randomly
-            direction = random.choice([-1.0, 1.0])
-            steer = direction * cfg.turn_steer
-            self._controller.drive_arcade(0.0, steer)
-            beat(0.0, steer)
-            bounded_sleep(random.uniform(cfg.turn_s_min, cfg.turn_s_max))
-
-            self._controller.stop()
-            beat(0.0, 0.0)
-            bounded_sleep(0.05)
-
-            obstacle = False
+        while not is_stopped():
+            mm = 0.0
+            if phase == sense:
+                try:
+                    mm = read_mm()
+                    last_mm = mm
+                except Exception:
+                    # If the sensor read fails momentarily, stop for safety.
+                    stop()
+                    if on_status:
+                        on_status({"mm": last_mm, "state": "sensor_error"})
+                    bounded_sleep(0.2)
+                    continue
+
+            rand_dir = rand_turn_s = 0.0
+            if phase == turn:
+                # Turn left or right randomly
+                i = self._rand_i
+                rand_dir = dirs[i]
+                rand_turn_s = turns[i]
+                if i + 1 == _RNG_BATCH:
+                    self._refill_random()
+                    dirs = self._dirs
+                    turns = self._turns
+                else:
+                    self._rand_i = i + 1
+
+            throttle, steering, sleep_s, obstacle, next_phase = policy(
+                phase, float(mm), near_mm, clear_mm, obstacle,
+                fwd, back, back_s, turn_steer,
+                rand_dir, rand_turn_s, period_s,
+            )
+
+            if phase == sense and on_status:
+                on_status({"mm": mm, "state": "forward" if next_phase == sense else "avoid"})
+
+            if throttle or steering:
+                drive(throttle, steering)
+            else:
+                stop()
+            beat(throttle, steering)
+
+            if phase == sense and next_phase == sense:
+                wait(sleep_s)
+            else:
+                bounded_sleep(sleep_s)
+            phase = next_phase
 
         self._controller.stop()
         beat(0.0, 0.0)
@@ -0,0 +1,44 @@
+"""Environment variable parsing shared by the robot entrypoints.
+
+Each module declares the variables it reads once, as {NAME: (type, default)},
+and gets back a namespace with one attribute per name:
+
+  from env_config import read_env
+  ENV = read_env({"DEADMAN_S": (float, 0.35), "PORT": (int, 8080)})
+  ENV.DEADMAN_S
+
+Plain ``int`` parses base 10, so pin numbers like ``05`` keep their meaning;
+use ``int_any_base`` as the type where hex is expected (I2C addresses).
+"""
+
+from __future__ import annotations
+
+import os
+from types import SimpleNamespace
+from typing import Any
+
+
+def int_any_base(raw: str) -> int:
+    """int type for read_env specs that accepts base prefixes (``0x29``)."""
+    return int(raw, 0)
+
+
+def read_env(spec: dict[str, tuple[type, Any]]) -> SimpleNamespace:
+    """Parse every variable in ``spec`` from os.environ in a single pass.
+
+    Unset or unparsable values fall back to the default; strings are
+    stripped.
+    """
+    env = os.environ
+    values: dict[str, Any] = {}
+    for name, (typ, default) in spec.items():
+        raw = env.get(name)
+        if raw is None:
+            values[name] = default
+            continue
+        raw = raw.strip()
+        try:
+            values[name] = typ(raw)
+        except ValueError:
+            values[name] = default
+    return SimpleNamespace(**values)
@@ -5,6 +5,13 @@ can use the same motor logic from other entrypoints (web, gamepad, etc.).
 
 Environment overrides (optional):
   PWMA, AIN1, AIN2, PWMB, BIN1, BIN2, STBY
+  HW_PWM=1   Use the Pi's hardware PWM via pigpio (needs `sudo pigpiod`).
+             PWMA=18 / PWMB=13 are hardware-PWM capable.
+  GPIOCHIP   gpiochip number for the lgpio backend (default 0)
+
+GPIO backends: pigpio when HW_PWM=1, otherwise lgpio (direct gpio_write/tx_pwm
+calls, no gpiozero device layer in the drive path), falling back to gpiozero
+when lgpio is not installed.
 
 Typical usage:
   from motor_controller import MotorController
@@ -14,27 +21,41 @@ Typical usage:
 
 from __future__ import annotations
 
-import os
+import atexit
+import functools
 import time
 
-from gpiozero import PWMOutputDevice, DigitalOutputDevice
-
+from env_config import read_env
 
-def _env_int(name: str, default: int) -> int:
-    try:
-        return int(os.environ.get(name, str(default)).strip())
-    except Exception:
-        return default
 
+_ENV = read_env(
+    {
+        "PWMA": (int, 18),
+        "AIN1": (int, 23),
+        "AIN2": (int, 24),
+        "PWMB": (int, 13),
+        "BIN1": (int, 6),
+        "BIN2": (int, 5),
+        "STBY": (int, 25),
+        "HW_PWM": (int, 0),
+        "GPIOCHIP": (int, 0),
+    }
+)
 
 # ----- Pin mapping (BCM) -----
-PWMA = _env_int("PWMA", 18)
-AIN1 = _env_int("AIN1", 23)
-AIN2 = _env_int("AIN2", 24)
-PWMB = _env_int("PWMB", 13)
-BIN1 = _env_int("BIN1", 6)
-BIN2 = _env_int("BIN2", 5)
-STBY = _env_int("STBY", 25)
+PWMA = _ENV.PWMA
+AIN1 = _ENV.AIN1
+AIN2 = _ENV.AIN2
+PWMB = _ENV.PWMB
+BIN1 = _ENV.BIN1
+BIN2 = _ENV.BIN2
+STBY = _ENV.STBY
+
+HW_PWM = _ENV.HW_PWM != 0
+GPIOCHIP = _ENV.GPIOCHIP
+
+_OUTPUT_PINS = (STBY, AIN1, AIN2, BIN1, BIN2)
+_PWM_PINS = (PWMA, PWMB)
 
 
 class MotorController:
@@ -46,47 +67,127 @@ class MotorController:
         right_mult: float = 0.87,
         max_pwm: float = 1.0,
         slew_rate: float = 6.0,
+        hardware_pwm: bool = HW_PWM,
     ):
-        self.stby = DigitalOutputDevice(STBY)
-        self.left_pwm = PWMOutputDevice(PWMA, frequency=pwm_freq_hz)
-        self.left_in1 = DigitalOutputDevice(AIN1)
-        self.left_in2 = DigitalOutputDevice(AIN2)
-        self.right_pwm = PWMOutputDevice(PWMB, frequency=pwm_freq_hz)
-        self.right_in1 = DigitalOutputDevice(BIN1)
-        self.right_in2 = DigitalOutputDevice(BIN2)
-
+        self.pwm_freq_hz = int(pwm_freq_hz)
         self.left_mult = float(left_mult)
         self.right_mult = float(right_mult)
         self.max_pwm = float(max_pwm)
         self.slew_rate = float(slew_rate)
 
+        # Hot-path GPIO functions: _write(pin, 0|1) and _set_pwm(pin, duty 0..1).
+        if hardware_pwm:
+            self._open_pigpio()
+        else:
+            try:
+                self._open_lgpio()
+            except ImportError:
+                self._open_gpiozero()
+        atexit.register(self.close)
+
         self._last_left = 0.0
         self._last_right = 0.0
         self._last_ts = time.monotonic()
 
+        self._motors = {"L": (PWMA, AIN1, AIN2), "R": (PWMB, BIN1, BIN2)}
+        # Last written (direction_sign, pwm_value) per motor, to skip redundant GPIO writes.
+        self._last = {"L": (0, 0.0), "R": (0, 0.0)}
+
         self.enable()
         self.stop()
 
+    def _open_pigpio(self):
+        try:
+            import pigpio
+        except Exception as exc:
+            raise RuntimeError(
+                "Hardware PWM needs pigpio. Install on the Pi:\n"
+                "  sudo apt install -y pigpio python3-pigpio\n"
+                "  sudo systemctl enable --now pigpiod\n"
+            ) from exc
+        pi = pigpio.pi()
+        if not pi.connected:
+            raise RuntimeError("Could not connect to pigpiod (is it running? sudo systemctl start pigpiod)")
+        freq = self.pwm_freq_hz
+
+        def set_pwm(pin: int, duty: float):
+            pi.hardware_PWM(pin, freq, int(duty * 1_000_000))
+
+        def close():
+            for pin in _PWM_PINS:
+                pi.hardware_PWM(pin, 0, 0)
+            pi.stop()
+
+        for pin in _OUTPUT_PINS:
+            pi.set_mode(pin, pigpio.OUTPUT)
+        self._write = pi.write
+        self._set_pwm = set_pwm
+        self._close = close
+
+    def _open_lgpio(self):
+        import lgpio
+
+        h = lgpio.gpiochip_open(GPIOCHIP)
+        for pin in _OUTPUT_PINS + _PWM_PINS:
+            lgpio.gpio_claim_output(h, pin, 0)
+        freq = self.pwm_freq_hz
+        tx_pwm = lgpio.tx_pwm
+
+        def set_pwm(pin: int, duty: float):
+            tx_pwm(h, pin, freq, duty * 100.0)
+
+        def close():
+            for pin in _PWM_PINS:
+                tx_pwm(h, pin, freq, 0)
+            lgpio.gpiochip_close(h)
+
+        self._write = functools.partial(lgpio.gpio_write, h)
+        self._set_pwm = set_pwm
+        self._close = close
+
+    def _open_gpiozero(self):
+        # Fallback for systems without lgpio (e.g. RPi.GPIO-only images).
+        from gpiozero import DigitalOutputDevice, PWMOutputDevice
+
+        devices = {pin: DigitalOutputDevice(pin) for pin in _OUTPUT_PINS}
+        devices.update({pin: PWMOutputDevice(pin, frequency=self.pwm_freq_hz) for pin in _PWM_PINS})
+
+        def set_value(pin: int, value: float):
+            devices[pin].value = value
+
+        def close():
+            for dev in devices.values():
+                dev.close()
+
+        self._write = set_value
+        self._set_pwm = set_value
+        self._close = close
+
+    def close(self):
+        """Release the GPIO backend. Safe to call more than once."""
+        close, self._close = self._close, None
+        if close is not None:
+            close()
+
     def enable(self):
-        self.stby.on()
+        self._write(STBY, 1)
 
     def disable(self):
-        self.stby.off()
+        self._write(STBY, 0)
 
     def stop(self):
-        self.left_pwm.value = 0
-        self.left_in1.off()
-        self.left_in2.off()
-        self.right_pwm.value = 0
-        self.right_in1.off()
-        self.right_in2.off()
+        write = self._write
+        for pwm, in1, in2 in self._motors.values():
+            self._set_pwm(pwm, 0.0)
+            write(in1, 0)
+            write(in2, 0)
         self._last_left = 0.0
         self._last_right = 0.0
         self._last_ts = time.monotonic()
-
-    @staticmethod
-    def _clamp(v: float, lo: float, hi: float) -> float:
-        return lo if v < lo else hi if v > hi else v
+        self._last = {"L": (0, 0.0), "R": (0, 0.0)}
+        # (throttle, steering) the motors have fully ramped to, or None while
+        # ramping / after a stop. Repeating this command is a no-op.
+        self.steady_cmd: tuple[float, float] | None = None
 
     @staticmethod
     def _approach(current: float, target: float, max_delta: float) -> float:
@@ -96,20 +197,27 @@ class MotorController:
             return min(target, current + max_delta)
         return max(target, current - max_delta)
 
-    def _apply_motor(self, pwm: PWMOutputDevice, in1: DigitalOutputDevice, in2: DigitalOutputDevice, value: float):
-        value = self._clamp(value, -self.max_pwm, self.max_pwm)
-        if value > 0:
-            in1.on()
-            in2.off()
-            pwm.value = value
-        elif value < 0:
-            in1.off()
-            in2.on()
-            pwm.value = -value
-        else:
-            pwm.value = 0
-            in1.off()
-            in2.off()
+    def _apply_motor(self, key: str, value: float):
+        pwm, in1, in2 = self._motors[key]
+        max_pwm = self.max_pwm
+        value = -max_pwm if value < -max_pwm else max_pwm if value > max_pwm else value
+        sign = 1 if value > 0 else -1 if value < 0 else 0
+        mag = abs(value)
+        last_sign, last_mag = self._last[key]
+
+        if sign == 0 and last_mag != 0.0:
+            # Drop PWM before releasing the direction pins.
+            self._set_pwm(pwm, 0.0)
+            last_mag = 0.0
+        if sign != last_sign:
+            write = self._write
+            write(in1, 1 if sign > 0 else 0)
+            write(in2, 1 if sign < 0 else 0)
+        if abs(mag - last_mag) > 1e-3:
+            self._set_pwm(pwm, mag)
+            last_mag = mag
+
+        self._last[key] = (sign, last_mag)
 
     def drive_arcade(self, throttle: float, steering: float):
         """Arcade drive.
@@ -118,28 +226,39 @@ class MotorController:
         steering: -1..1 (right positive)
         """
 
-        throttle = self._clamp(float(throttle), -1.0, 1.0)
-        steering = self._clamp(float(steering), -1.0, 1.0)
+        t = -1.0 if throttle < -1.0 else 1.0 if throttle > 1.0 else throttle
+        s = -1.0 if steering < -1.0 else 1.0 if steering > 1.0 else steering
 
-        left = throttle + steering
-        right = throttle - steering
+        left = t + s
+        right = t - s
 
-        mag = max(abs(left), abs(right), 1.0)
-        left /= mag
-        right /= mag
+        # Normalize only when mixing pushed a side past full scale.
+        m = abs(left)
+        r = abs(right)
+        if r > m:
+            m = r
+        if m > 1.0:
+            inv = 1.0 / m
+            left *= inv
+            right *= inv
 
         left *= self.left_mult
         right *= self.right_mult
 
+        steady = True
         if self.slew_rate > 0:
             now = time.monotonic()
             dt = max(now - self._last_ts, 0.0)
             max_delta = self.slew_rate * dt
+            target_left = left
+            target_right = right
             left = self._approach(self._last_left, left, max_delta)
             right = self._approach(self._last_right, right, max_delta)
             self._last_left = left
             self._last_right = right
             self._last_ts = now
+            steady = left == target_left and right == target_right
 
-        self._apply_motor(self.left_pwm, self.left_in1, self.left_in2, left)
-        self._apply_motor(self.right_pwm, self.right_in1, self.right_in2, right)
+        self._apply_motor("L", left)
+        self._apply_motor("R", right)
+        self.steady_cmd = (throttle, steering) if steady else None
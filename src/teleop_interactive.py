@@ -1,24 +1,5 @@
-import sys, time, termios, tty, select
-from gpiozero import PWMOutputDevice, DigitalOutputDevice
-
-# ----- Pin mapping (BCM) -----
-# Left motor (A)
-PWMA=18; AIN1=23; AIN2=24
-# Right motor (B) (direction fixed)
-PWMB=13; BIN1=6; BIN2=5
-# Standby
-STBY=25
-
-# ----- Devices -----
-stby = DigitalOutputDevice(STBY)
-stby.on()
-
-left_pwm  = PWMOutputDevice(PWMA, frequency=1000)
-left_in1  = DigitalOutputDevice(AIN1)
-left_in2  = DigitalOutputDevice(AIN2)
-right_pwm = PWMOutputDevice(PWMB, frequency=1000)
-right_in1 = DigitalOutputDevice(BIN1)
-right_in2 = DigitalOutputDevice(BIN2)
+import sys, time, termios, tty, selectors
+from motor_controller import MotorController
 
 speed = 0.25
 turn  = 0.25
@@ -26,29 +7,12 @@ timeout = 0.6  # deadman stop
 left_mult = 1.0
 right_mult = 0.87
 
-def stop_all():
-    left_pwm.value = 0; left_in1.off(); left_in2.off()
-    right_pwm.value = 0; right_in1.off(); right_in2.off()
-
-def forward():
-    left_in1.on(); left_in2.off(); left_pwm.value = left_mult * speed
-    right_in1.on(); right_in2.off(); right_pwm.value = right_mult * speed
-
-def backward():
-    left_in1.off(); left_in2.on(); left_pwm.value = left_mult * speed
-    right_in1.off(); right_in2.on(); right_pwm.value = right_mult * speed
-
-def left():
-    left_in1.off(); left_in2.on(); left_pwm.value = turn
-    right_in1.on(); right_in2.off(); right_pwm.value = turn
-
-def right():
-    left_in1.on(); left_in2.off(); left_pwm.value = turn
-    right_in1.off(); right_in2.on(); right_pwm.value = turn
+# Pin mapping, STBY and GPIO backend all come from motor_controller.
+# slew_rate=0: one drive_arcade per key event, so each press must apply in full.
+controller = MotorController(max_pwm=1.0, left_mult=left_mult, right_mult=right_mult, slew_rate=0.0)
 
-def read_key():
-    r,_,_ = select.select([sys.stdin], [], [], 0.05)
-    if not r:
+def read_key(sel):
+    if not sel.select(timeout=0.05):
         return None
     ch = sys.stdin.read(1)
 
@@ -59,38 +23,42 @@ def main():
     fd = sys.stdin.fileno()
     old = termios.tcgetattr(fd)
     tty.setcbreak(fd)
+    # Persistent registration (epoll on Linux) instead of rebuilding an fd set per key poll.
+    sel = selectors.DefaultSelector()
+    sel.register(sys.stdin, selectors.EVENT_READ)
 
     print("Interactive Teleop")
     print("W/A/S/D = move | SPACE = stop | Q = quit")
-    stop_all()
-    last = time.time()
+    controller.stop()
+    last = time.monotonic()
 
     try:
         while True:
-            key = read_key()
-            now = time.time()
+            key = read_key(sel)
+            now = time.monotonic()
 
             if key:
                 last = now
                 if key == 'q':
                     break
                 elif key in ('w'):
-                    forward()
+                    controller.drive_arcade(speed, 0.0)
                 elif key in ('s'):
-                    backward()
+                    controller.drive_arcade(-speed, 0.0)
                 elif key in ('a'):
-                    left()
+                    controller.drive_arcade(0.0, -turn)
                 elif key in ('d'):
-                    right()
+                    controller.drive_arcade(0.0, turn)
                 elif key == 'space':
-                    stop_all()
+                    controller.stop()
 
             if now - last > timeout:
-                stop_all()
+                controller.stop()
 
     finally:
-        stop_all()
-        stby.off()
+        controller.stop()
+        controller.disable()
+        sel.close()
         termios.tcsetattr(fd, termios.TCSADRAIN, old)
         print("\nStopped.")
 
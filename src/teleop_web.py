@@ -2,6 +2,7 @@
 
 - Hosts a simple joystick page at '/'
 - Receives drive commands at POST /api/drive {"throttle": -1..1, "steering": -1..1}
+  or, with flask-sock installed, as binary frames on the /ws WebSocket
 - Deadman safety: if commands stop arriving, motors stop
 
 Works well from iOS Safari on the same Wi-Fi.
@@ -11,38 +12,63 @@ and pass it as a query param (?token=...) or header (X-Teleop-Token).
 
 Requires:
   sudo apt install -y python3-flask
+
+Optional (faster JSON encode/decode on the Pi):
+  pip3 install orjson
+
+Optional (drive commands over a WebSocket at /ws instead of 20 Hz POSTs):
+  pip3 install flask-sock
 """
 
 from __future__ import annotations
 
 import atexit
+import gzip
+import hashlib
+import json
+import math
 import os
 import signal
+import socket
+import struct
 import time
 from threading import Event, Lock
 
-from flask import Flask, Response, jsonify, request, render_template_string
+from flask import Flask, Response, request
+from werkzeug.serving import WSGIRequestHandler
 
-from autonomous_vl53l0x import AutoAvoidRunner
-from motor_controller import MotorController
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is used instead
+    orjson = None
 
+try:
+    from flask_sock import Sock
+except ImportError:  # optional; the UI then keeps using HTTP POSTs
+    Sock = None
 
-def _env_float(name: str, default: float) -> float:
-    try:
-        return float(os.environ.get(name, str(default)).strip())
-    except Exception:
-        return default
+from autonomous_vl53l0x import AutoAvoidRunner
+from env_config import read_env
+from motor_controller import MotorController
 
 
-def _env_int(name: str, default: int) -> int:
-    try:
-        return int(os.environ.get(name, str(default)).strip())
-    except Exception:
-        return default
+_ENV = read_env(
+    {
+        "DEADMAN_S": (float, 0.35),
+        "MAX_PWM": (float, 0.6),
+        "LEFT_MULT": (float, 1.0),
+        "RIGHT_MULT": (float, 0.87),
+        "HOST": (str, "0.0.0.0"),
+        "PORT": (int, 8080),
+        "TELEOP_TOKEN": (str, ""),
+        "RT_CPU": (int, 3),
+        "RT_PRIO": (int, 80),
+    }
+)
 
 
 def _check_token() -> bool:
-    token = os.environ.get("TELEOP_TOKEN", "").strip()
+    token = TELEOP_TOKEN
     if not token:
         return True
 
@@ -55,6 +81,87 @@ def _check_token() -> bool:
 
 app = Flask(__name__)
 
+# Drive bodies are tiny; decode them without Flask's get_json() machinery.
+_json_loads = orjson.loads if orjson is not None else json.loads
+_DRIVE_BODY_MAX = 128
+_OK_BODY = b'{"ok":true}'
+
+# WebSocket drive frame: little-endian float32 throttle, steering.
+_DRIVE_FRAME = struct.Struct("<ff")
+# How often an idle WebSocket re-checks the deadman state for push updates.
+_WS_STATUS_S = 0.1
+_WS_DEADMAN_MSG = {
+    None: '{"deadman_ok":null}',
+    True: '{"deadman_ok":true}',
+    False: '{"deadman_ok":false}',
+}
+
+if orjson is not None:
+    from flask.json.provider import DefaultJSONProvider
+
+    class _OrjsonProvider(DefaultJSONProvider):
+        """Routes app.json (status responses) through orjson."""
+
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj).decode("utf-8")
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = _OrjsonProvider(app)
+
+
+# Linux-only; re-armed per request because the kernel clears it after use.
+_TCP_QUICKACK = getattr(socket, "TCP_QUICKACK", None)
+
+
+class _TeleopRequestHandler(WSGIRequestHandler):
+    """Request handler tuned for the small, frequent drive POSTs.
+
+    - TCP_NODELAY: replies go out immediately instead of waiting in Nagle's
+      buffer (up to ~40 ms, most of a 50 ms command period).
+    - TCP_QUICKACK: ACK incoming commands right away instead of delaying.
+    - No per-request access log line: the UI sends ~20 drive commands/s plus
+      status polls, and formatting/writing each one is a noticeable share of
+      CPU on a Pi Zero.
+    """
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def handle_one_request(self):
+        if _TCP_QUICKACK is not None:
+            try:
+                self.connection.setsockopt(socket.IPPROTO_TCP, _TCP_QUICKACK, 1)
+            except OSError:
+                pass
+        super().handle_one_request()
+
+    def log_request(self, code="-", size="-"):
+        pass
+
+
+class _LatestCommand:
+    """Single-slot "latest value" buffer from request threads to the control thread.
+
+    Producers overwrite the slot and the consumer only ever applies the newest
+    command. A reference assignment is atomic in CPython, so neither side
+    takes a lock. ``None`` means "stop".
+    """
+
+    __slots__ = ("_value",)
+
+    def __init__(self):
+        self._value: tuple[float, float] | None = None
+
+    def write(self, value: tuple[float, float] | None):
+        self._value = value
+
+    def read_latest(self) -> tuple[float, float] | None:
+        return self._value
+
+
 # Control state
 _state_lock = Lock()
 _last_cmd_ts = 0.0
@@ -70,15 +177,29 @@ _sd_running = False
 _sd_last_mm: int | None = None
 _sd_last_state: str | None = None
 
+# Set on every heartbeat; the deadman thread waits on it instead of polling.
+_cmd_event = Event()
+
+# Manual drive commands: request threads publish, one control thread writes GPIO.
+_drive_cmd = _LatestCommand()
+_drive_event = Event()
+_control_thread = None
+# Held while the control thread writes the controller. Self-drive start takes
+# it to stop the motors and hand the controller to the runner; while
+# _runner_owns_controller is set the control thread leaves it alone.
+_controller_lock = Lock()
+_runner_owns_controller = False
+
 # Process shutdown coordination (prevents daemon-thread issues at interpreter finalization)
 _shutdown_event = Event()
 _deadman_thread = None
 
 # Safety / tuning
-DEADMAN_S = _env_float("DEADMAN_S", 0.35)
-MAX_PWM = _env_float("MAX_PWM", 0.6)  # keep it conservative for phone control
-LEFT_MULT = _env_float("LEFT_MULT", 1.0)
-RIGHT_MULT = _env_float("RIGHT_MULT", 0.87)
+DEADMAN_S = _ENV.DEADMAN_S
+MAX_PWM = _ENV.MAX_PWM  # keep it conservative for phone control
+LEFT_MULT = _ENV.LEFT_MULT
+RIGHT_MULT = _ENV.RIGHT_MULT
+TELEOP_TOKEN = _ENV.TELEOP_TOKEN
 
 controller = MotorController(left_mult=LEFT_MULT, right_mult=RIGHT_MULT, max_pwm=MAX_PWM)
 
@@ -89,10 +210,11 @@ def _heartbeat_cmd(throttle: float = 0.0, steering: float = 0.0):
     _last_cmd_ts = time.time()
     _last_throttle = float(throttle)
     _last_steering = float(steering)
+  _cmd_event.set()
 
 
 def _stop_selfdrive(*, join_timeout_s: float = 1.5):
-  global _sd_stop_event, _sd_thread, _sd_running
+  global _sd_stop_event, _sd_thread, _sd_running, _runner_owns_controller
 
   with _sd_lock:
     ev = _sd_stop_event
@@ -109,6 +231,10 @@ def _stop_selfdrive(*, join_timeout_s: float = 1.5):
     except Exception:
       pass
 
+  if _runner_owns_controller:
+    with _controller_lock:
+      _runner_owns_controller = False
+
 
 def _start_selfdrive():
   global _sd_stop_event, _sd_thread, _sd_running
@@ -149,6 +275,8 @@ def _start_selfdrive():
 def _safe_shutdown():
   try:
     _shutdown_event.set()
+    _cmd_event.set()  # wake the deadman/control threads so they can exit
+    _drive_event.set()
   except Exception:
     pass
   try:
@@ -181,6 +309,8 @@ def _handle_sigterm(_signum, _frame):
     # Ensure we stop/disable before exiting on service shutdown.
   try:
     _shutdown_event.set()
+    _cmd_event.set()  # wake the deadman/control threads so they can exit
+    _drive_event.set()
   except Exception:
     pass
     _safe_shutdown()
@@ -357,6 +487,38 @@ HTML = r"""<!doctype html>
     }
   }
 
+  // Drive commands go over a WebSocket when the server offers /ws (the server
+  // pushes deadman changes back on it); otherwise POST /api/drive is used.
+  let ws = null;
+  function openSocket() {
+    const proto = location.protocol === 'https:' ? 'wss://' : 'ws://';
+    const sock = new WebSocket(proto + location.host + '/ws' + location.search);
+    sock.binaryType = 'arraybuffer';
+    sock.onopen = () => {
+      ws = sock;
+      setStatus(true, 'Connected');
+    };
+    sock.onmessage = (e) => {
+      if (typeof e.data !== 'string') return;
+      const m = JSON.parse(e.data);
+      if (!('deadman_ok' in m)) return;
+      if (m.deadman_ok === null) setSafety(false, 'Deadman: idle');
+      else setSafety(m.deadman_ok, m.deadman_ok ? 'Deadman: OK' : 'Deadman: STOPPED');
+    };
+    sock.onclose = (e) => {
+      // Only reconnect if it worked before; a server without /ws stays on HTTP.
+      if (ws !== sock) return;
+      ws = null;
+      if (e.code === 1008) {
+        // Bad token: retrying cannot help; stay on HTTP (which reports 401).
+        setStatus(false, 'Unauthorized');
+        return;
+      }
+      setStatus(false, 'Disconnected');
+      setTimeout(openSocket, 1000);
+    };
+  }
+
   async function send(throttle, steering) {
     if (mode !== 'joystick') return;
     const now = performance.now();
@@ -364,17 +526,23 @@ HTML = r"""<!doctype html>
     if (now - lastSend < 50) return;
     lastSend = now;
 
-    try {
-      const res = await fetch('/api/drive' + location.search, {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ throttle, steering })
-      });
-      if (!res.ok) throw new Error('HTTP ' + res.status);
-      setStatus(true, 'Connected');
+    if (ws) {
+      // 8-byte binary frame: little-endian float32 throttle, steering.
+      ws.send(new Float32Array([throttle, steering]).buffer);
       sentCount++;
-    } catch (e) {
-      setStatus(false, 'Disconnected');
+    } else {
+      try {
+        const res = await fetch('/api/drive' + location.search, {
+          method: 'POST',
+          headers: { 'Content-Type': 'application/json' },
+          body: JSON.stringify({ throttle, steering })
+        });
+        if (!res.ok) throw new Error('HTTP ' + res.status);
+        setStatus(true, 'Connected');
+        sentCount++;
+      } catch (e) {
+        setStatus(false, 'Disconnected');
+      }
     }
 
     const t = performance.now();
@@ -397,6 +565,7 @@ HTML = r"""<!doctype html>
     knob.style.left = '50%';
     knob.style.top = '50%';
     if (mode === 'joystick') {
+      if (ws) ws.send(new Float32Array([0, 0]).buffer);
       try {
         await fetch('/api/stop' + location.search, { method: 'POST' });
       } catch (_) {}
@@ -515,7 +684,9 @@ HTML = r"""<!doctype html>
         mode = s.mode;
         applySelfDriveButton();
       }
-      if (s.last_cmd_age_s == null) {
+      if (ws) {
+        // Deadman state is pushed over the WebSocket.
+      } else if (s.last_cmd_age_s == null) {
         setSafety(false, 'Deadman: idle');
       } else if (s.last_cmd_age_s > s.deadman_s) {
         setSafety(false, 'Deadman: STOPPED');
@@ -528,6 +699,7 @@ HTML = r"""<!doctype html>
   }, STATUS_POLL_MS);
 
   // Initial ping
+  openSocket();
   send(0, 0);
 })();
 </script>
@@ -536,28 +708,91 @@ HTML = r"""<!doctype html>
 """
 
 
+# The page is static: encode/compress it once instead of per request.
+_HTML_BYTES = HTML.encode("utf-8")
+_HTML_GZ = gzip.compress(_HTML_BYTES, compresslevel=6)
+# Strong validators must differ per content encoding, so each body gets its own tag.
+_HTML_HASH = hashlib.blake2b(_HTML_BYTES, digest_size=8).hexdigest()
+_HTML_ETAG = '"%s"' % _HTML_HASH
+_HTML_GZ_ETAG = '"%s-gz"' % _HTML_HASH
+_HTML_CACHE = {"Cache-Control": "public, max-age=3600", "Vary": "Accept-Encoding"}
+_HTML_HEADERS = {**_HTML_CACHE, "ETag": _HTML_ETAG}
+_HTML_GZ_HEADERS = {**_HTML_CACHE, "ETag": _HTML_GZ_ETAG}
+
+
 @app.get("/")
 def index():
-    return render_template_string(HTML)
+    if "gzip" in request.headers.get("Accept-Encoding", ""):
+        body, etag, headers = _HTML_GZ, _HTML_GZ_ETAG, _HTML_GZ_HEADERS
+    else:
+        body, etag, headers = _HTML_BYTES, _HTML_ETAG, _HTML_HEADERS
+    if request.headers.get("If-None-Match") == etag:
+        return Response(status=304, headers=headers)
+    if body is _HTML_GZ:
+        return Response(body, mimetype="text/html", headers={**headers, "Content-Encoding": "gzip"})
+    return Response(body, mimetype="text/html", headers=headers)
 
 
-@app.post("/api/drive")
-def api_drive():
-    if not _check_token():
-        return Response("Unauthorized\n", status=401)
+def _ok() -> Response:
+    return Response(_OK_BODY, mimetype="application/json")
 
-    data = request.get_json(silent=True) or {}
-    throttle = float(data.get("throttle", 0.0))
-    steering = float(data.get("steering", 0.0))
 
+def _submit_drive(throttle: float, steering: float):
     global _mode
     # Manual input takes control immediately.
     _stop_selfdrive()
     _mode = "joystick"
     _heartbeat_cmd(throttle, steering)
 
-    controller.drive_arcade(throttle, steering)
-    return jsonify(ok=True)
+    _drive_cmd.write((throttle, steering))
+    _drive_event.set()
+
+
+@app.post("/api/drive")
+def api_drive():
+    if not _check_token():
+        return Response("Unauthorized\n", status=401)
+
+    raw = request.stream.read(_DRIVE_BODY_MAX)
+    try:
+        data = _json_loads(raw) if raw else {}
+        throttle = float(data.get("throttle", 0.0))
+        steering = float(data.get("steering", 0.0))
+    except (ValueError, TypeError, AttributeError):
+        return Response("Bad drive command\n", status=400)
+
+    _submit_drive(throttle, steering)
+    return _ok()
+
+
+if Sock is not None:
+    sock = Sock(app)
+
+    @sock.route("/ws")
+    def ws_drive(ws):
+        """Binary drive frames in, {"deadman_ok": bool} out on transitions."""
+        if not _check_token():
+            # 1008 (policy violation) tells the page not to reconnect.
+            ws.close(reason=1008, message="Unauthorized")
+            return
+
+        unpack = _DRIVE_FRAME.unpack
+        frame_size = _DRIVE_FRAME.size
+        deadman_ok = 0  # sentinel: nothing pushed yet
+        while True:
+            data = ws.receive(timeout=_WS_STATUS_S)
+            if isinstance(data, (bytes, bytearray)) and len(data) == frame_size:
+                throttle, steering = unpack(data)
+                if math.isfinite(throttle) and math.isfinite(steering):
+                    _submit_drive(throttle, steering)
+
+            with _state_lock:
+                ts = _last_cmd_ts
+            # None: no command yet (idle), matching the HTTP status poll.
+            ok = time.time() - ts <= DEADMAN_S if ts else None
+            if ok is not deadman_ok:
+                deadman_ok = ok
+                ws.send(_WS_DEADMAN_MSG[ok])
 
 
 @app.post("/api/stop")
@@ -568,20 +803,26 @@ def api_stop():
     _stop_selfdrive()
     _mode = "joystick"
     _heartbeat_cmd(0.0, 0.0)
-    controller.stop()
-    return jsonify(ok=True)
+    _drive_cmd.write(None)
+    _drive_event.set()
+    return _ok()
 
 
 @app.post("/api/selfdrive/start")
 def api_selfdrive_start():
     if not _check_token():
         return Response("Unauthorized\n", status=401)
-    global _mode
-    controller.stop()
+    global _mode, _runner_owns_controller
+    with _controller_lock:
+        # Under the lock the control thread is not mid-write, and once the
+        # flag is set it will not touch the controller until self-drive stops.
+        _drive_cmd.write(None)
+        controller.stop()
+        _runner_owns_controller = True
     _mode = "selfdrive"
     _heartbeat_cmd(0.0, 0.0)
     _start_selfdrive()
-    return jsonify(ok=True)
+    return _ok()
 
 
 @app.post("/api/selfdrive/stop")
@@ -592,41 +833,169 @@ def api_selfdrive_stop():
     _stop_selfdrive()
     _mode = "joystick"
     _heartbeat_cmd(0.0, 0.0)
-    controller.stop()
-    return jsonify(ok=True)
+    _drive_cmd.write(None)
+    _drive_event.set()
+    return _ok()
+
+
+# (key, body, ETag) for the last /api/status response. The ETag is a per-process
+# prefix plus a generation counter bumped on every rebuild, so a tag held from
+# an earlier server run can never match. Replaced as one tuple so concurrent
+# requests never see a torn update.
+_STATUS_ETAG_PREFIX = os.urandom(4).hex()
+_status_cache: tuple = (None, "", '"%s-0"' % _STATUS_ETAG_PREFIX)
+_status_gen = 0
 
 
 @app.get("/api/status")
 def api_status():
+    global _status_cache, _status_gen
     with _state_lock:
-        age = time.time() - _last_cmd_ts if _last_cmd_ts else None
-        return jsonify(
-            last_cmd_age_s=age,
-            deadman_s=DEADMAN_S,
-            throttle=_last_throttle,
-            steering=_last_steering,
-            mode=_mode,
-            selfdrive_running=_sd_running,
-            selfdrive_mm=_sd_last_mm,
-            selfdrive_state=_sd_last_state,
-            max_pwm=MAX_PWM,
-            left_mult=LEFT_MULT,
-            right_mult=RIGHT_MULT,
+        ts = _last_cmd_ts
+        throttle = _last_throttle
+        steering = _last_steering
+    age = time.time() - ts if ts else None
+    # Keyed on the command timestamp, not the ever-growing age: once the
+    # deadman has expired the status is stable and polls revalidate to 304.
+    # The page only compares last_cmd_age_s against deadman_s, which a cached
+    # body still answers correctly.
+    key = (
+        ts,
+        age is not None and age > DEADMAN_S,
+        throttle,
+        steering,
+        _mode,
+        _sd_running,
+        _sd_last_mm,
+        _sd_last_state,
+    )
+
+    cached_key, body, etag = _status_cache
+    if key == cached_key:
+        if request.headers.get("If-None-Match") == etag:
+            return Response(status=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    else:
+        body = app.json.dumps(
+            {
+                "last_cmd_age_s": age,
+                "deadman_s": DEADMAN_S,
+                "throttle": throttle,
+                "steering": steering,
+                "mode": _mode,
+                "selfdrive_running": _sd_running,
+                "selfdrive_mm": _sd_last_mm,
+                "selfdrive_state": _sd_last_state,
+                "max_pwm": MAX_PWM,
+                "left_mult": LEFT_MULT,
+                "right_mult": RIGHT_MULT,
+            }
         )
+        with _state_lock:
+            _status_gen += 1
+            etag = '"%s-%d"' % (_STATUS_ETAG_PREFIX, _status_gen)
+        _status_cache = (key, body, etag)
+
+    # no-cache: the browser must revalidate each poll (cheap 304 when unchanged).
+    return Response(
+        body,
+        mimetype="application/json",
+        headers={"ETag": etag, "Cache-Control": "no-cache"},
+    )
+
+
+def _make_thread_realtime():
+    """Run the calling thread on CPU RT_CPU under SCHED_FIFO (Linux only).
+
+    Keeps the deadman/control threads from being preempted by request
+    threads. SCHED_FIFO needs CAP_SYS_NICE, e.g.:
+      sudo setcap cap_sys_nice+ep "$(readlink -f "$(which python3)")"
+    Without it (or off Linux) the thread just keeps the default policy.
+    """
+    cpu = _ENV.RT_CPU
+    try:
+        if cpu >= 0 and cpu in os.sched_getaffinity(0):
+            os.sched_setaffinity(0, {cpu})
+    except (AttributeError, OSError):
+        pass
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(_ENV.RT_PRIO))
+    except (AttributeError, OSError):
+        pass
+
+
+def _lock_memory():
+    """mlockall() so page faults cannot stall the deadman/control threads.
+
+    Only attempted when RLIMIT_MEMLOCK is unlimited (e.g. systemd
+    LimitMEMLOCK=infinity); with a finite limit MCL_FUTURE would make later
+    allocations fail once the process outgrows it.
+    """
+    try:
+        import ctypes
+        import resource
+
+        if resource.getrlimit(resource.RLIMIT_MEMLOCK)[0] != resource.RLIM_INFINITY:
+            return
+        mcl_current, mcl_future = 1, 2
+        ctypes.CDLL(None, use_errno=True).mlockall(mcl_current | mcl_future)
+    except (ImportError, AttributeError, OSError):
+        pass
 
 
 def _deadman_loop(stop_event: Event):
-    global _last_cmd_ts
-    while not stop_event.is_set():
-        time.sleep(0.05)
-        with _state_lock:
-            ts = _last_cmd_ts
-        if not ts:
-            continue
-        if time.time() - ts > DEADMAN_S:
-            # If we are not receiving heartbeats, stop everything.
-            _stop_selfdrive()
-            controller.stop()
+    _make_thread_realtime()
+    wait = _cmd_event.wait
+    clear = _cmd_event.clear
+    is_stopped = stop_event.is_set
+    deadman_s = DEADMAN_S
+    while not is_stopped():
+        # Idle until the first heartbeat (or shutdown) arrives.
+        wait()
+        clear()
+        # Each heartbeat re-arms the timer; DEADMAN_S of silence trips it.
+        while wait(deadman_s) and not is_stopped():
+            clear()
+        if is_stopped():
+            break
+        # If we are not receiving heartbeats, stop everything.
+        _stop_selfdrive()
+        _drive_cmd.write(None)
+        _drive_event.set()
+
+
+def _control_loop(stop_event: Event):
+    # Sole writer of manual drive commands and stops: request threads and the
+    # deadman only publish to _drive_cmd. The self-drive runner drives the
+    # controller directly; _controller_lock and _runner_owns_controller hand
+    # it over (api_selfdrive_start) and back (_stop_selfdrive, after the join).
+    _make_thread_realtime()
+    wait = _drive_event.wait
+    clear = _drive_event.clear
+    is_stopped = stop_event.is_set
+    read_latest = _drive_cmd.read_latest
+    drive = controller.drive_arcade
+    stop = controller.stop
+    lock = _controller_lock
+    while True:
+        wait()
+        clear()
+        if is_stopped():
+            break
+        cmd = read_latest()
+        with lock:
+            if _runner_owns_controller:
+                continue
+            if cmd is None:
+                stop()
+                continue
+            # Held buttons resend the same command at 20 Hz; once the motors have
+            # ramped to it, re-applying changes nothing. The deadman is fed by
+            # the request itself, so skipping here does not affect it.
+            throttle, steering = cmd
+            steady = controller.steady_cmd
+            if steady is not None and abs(throttle - steady[0]) < 1e-3 and abs(steering - steady[1]) < 1e-3:
+                continue
+            drive(throttle, steering)
 
 
 def main():
@@ -638,20 +1007,26 @@ def main():
         # Not all platforms support SIGTERM/signal handling the same way.
         pass
 
+    _lock_memory()
+
     global _deadman_thread
     _deadman_thread = threading.Thread(target=_deadman_loop, args=(_shutdown_event,), daemon=False)
     _deadman_thread.start()
 
-    host = os.environ.get("HOST", "0.0.0.0")
-    port = _env_int("PORT", 8080)
+    global _control_thread
+    _control_thread = threading.Thread(target=_control_loop, args=(_shutdown_event,), daemon=False)
+    _control_thread.start()
+
+    host = _ENV.HOST
+    port = _ENV.PORT
 
     print("Wi-Fi Teleop server")
     print(f"Open: http://<pi-ip>:{port}")
-    if os.environ.get("TELEOP_TOKEN"):
+    if TELEOP_TOKEN:
         print("Token enabled: append ?token=... to the URL")
 
     try:
-        app.run(host=host, port=port, threaded=True)
+        app.run(host=host, port=port, threaded=True, request_handler=_TeleopRequestHandler)
     finally:
         _safe_shutdown()
 
@@ -5,7 +5,8 @@ What this does:
 - Reads distance continuously and prints it in millimeters
 
 Recommended driver (Adafruit CircuitPython):
-  pip3 install adafruit-blinka adafruit-circuitpython-vl53l0x smbus2
+  pip3 install adafruit-blinka adafruit-circuitpython-vl53l0x
+  pip3 install smbus2  (optional; combined-transaction fast read path)
 
 On Raspberry Pi, also enable I2C:
   sudo raspi-config   -> Interface Options -> I2C -> Enable
@@ -14,6 +15,7 @@ On Raspberry Pi, also enable I2C:
 Quick checks:
   python3 src/test_vl53l0x.py --scan
   python3 src/test_vl53l0x.py
+  python3 src/test_vl53l0x.py --count 200 --stats   (calibration run; needs numpy)
 
 Notes:
 - The VL53L0X is a sensor. TB6612FNG is your motor driver.
@@ -23,60 +25,208 @@ Notes:
 from __future__ import annotations
 
 import argparse
+import asyncio
+import errno
 import os
-import platform
+import struct
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 
+try:
+    import fcntl
+except ImportError:  # Windows: no i2c-dev; the scan reports the error instead
+    fcntl = None
 
-def _scan_i2c(bus: int) -> list[int]:
+# Driver modules are imported once at load; _init_sensor reports _IMPORT_ERR.
+if sys.platform.startswith("linux"):
     try:
-        from smbus2 import SMBus
-    except Exception as exc:
+        import board
+        import busio
+        import adafruit_vl53l0x
+
+        _IMPORT_ERR: Exception | None = None
+    except Exception as exc:  # Blinka raises more than ImportError on unknown boards
+        board = busio = adafruit_vl53l0x = None
+        _IMPORT_ERR = exc
+else:
+    board = busio = adafruit_vl53l0x = None
+    _IMPORT_ERR = ImportError(f"Blinka board support is not available on {sys.platform}")
+
+
+# Linux i2c-dev ioctls (linux/i2c-dev.h, linux/i2c.h)
+I2C_SLAVE = 0x0703
+I2C_SMBUS = 0x0720
+_I2C_SMBUS_WRITE = 0
+_I2C_SMBUS_QUICK = 0
+# struct i2c_smbus_ioctl_data {u8 read_write; u8 command; u32 size; void *data;}
+_SMBUS_QUICK_WRITE = struct.pack("@BBxxIP", _I2C_SMBUS_WRITE, 0, _I2C_SMBUS_QUICK, 0)
+
+
+def _probe_addr(fd: int, addr: int) -> bool:
+    try:
+        fcntl.ioctl(fd, I2C_SLAVE, addr)
+    except OSError as exc:
+        # EBUSY: a kernel driver owns the address (i2cdetect shows "UU").
+        return exc.errno == errno.EBUSY
+    try:
+        # Same probe choice as i2cdetect: a read for EEPROM-style ranges where
+        # a quick write can corrupt state, SMBus quick write everywhere else.
+        if 0x30 <= addr <= 0x37 or 0x50 <= addr <= 0x5F:
+            os.read(fd, 1)
+        else:
+            fcntl.ioctl(fd, I2C_SMBUS, _SMBUS_QUICK_WRITE)
+    except OSError:
+        return False
+    return True
+
+
+def _scan_i2c(bus: int, *, target: int | None = None) -> list[int]:
+    """Return responding addresses on ``bus``.
+
+    With ``target``, that address is probed first and ``[target]`` is returned
+    as soon as it ACKs; the full sweep only runs if it does not.
+    """
+    path = f"/dev/i2c-{bus}"
+    try:
+        fd = os.open(path, os.O_RDWR)
+    except OSError as exc:
         raise RuntimeError(
-            "smbus2 not installed. Install with: pip3 install smbus2\n"
+            f"Cannot open {path}: {exc.strerror}. Is I2C enabled (sudo raspi-config)?\n"
             "Alternatively run: sudo apt install -y i2c-tools && i2cdetect -y 1"
         ) from exc
 
-    found: list[int] = []
+    try:
+        if target is not None and _probe_addr(fd, target):
+            return [target]
+        return [addr for addr in range(0x03, 0x78) if _probe_addr(fd, addr)]
+    finally:
+        os.close(fd)
+
+
+# Output lines are buffered and written this many at a time, or after this
+# long, so a slow --hz still shows ranges live.
+OUT_BATCH = 32
+OUT_FLUSH_S = 0.25
+# Bound once so the loop skips re-parsing an f-string per sample.
+_FMT = "{:.3f}  range_mm={}\n".format
+
+# VL53L0X registers for the fast read path (8-bit register addresses).
+_SYSTEM_INTERRUPT_CONFIG_GPIO = 0x0A
+_SYSTEM_INTERRUPT_CLEAR = 0x0B
+_RESULT_INTERRUPT_STATUS = 0x13  # low 3 bits non-zero once a sample is ready
+# One read of 0x13..0x1F: byte 0 is the ready flag, bytes 11-12 the range
+# (RESULT_RANGE_STATUS + 10, big-endian mm).
+_RESULT_BLOCK_LEN = 13
+
+
+def _fast_range_reader(bus: int, address: int):
+    """Return (read_mm, close) using two I2C_RDWR ioctls per sample.
+
+    The register-pointer write and result-block read go out as one combined
+    transaction (repeated START); the interrupt clear follows as its own
+    write, since the Pi's i2c-bcm2835 driver only accepts a read as the last
+    message of a transfer. read_mm returns None, without clearing, when the
+    sensor has not finished a new sample since the last read. Raises
+    ImportError if smbus2 is not installed.
+    """
+    from smbus2 import SMBus, i2c_msg
+
+    smbus = SMBus(bus)
+    write_ptr = i2c_msg.write(address, [_RESULT_INTERRUPT_STATUS])
+    read_val = i2c_msg.read(address, _RESULT_BLOCK_LEN)
+    clear = i2c_msg.write(address, [_SYSTEM_INTERRUPT_CLEAR, 0x01])
+    i2c_rdwr = smbus.i2c_rdwr
+
+    def read_mm() -> int | None:
+        i2c_rdwr(write_ptr, read_val)
+        block = bytes(read_val)
+        if not block[0] & 0x07:
+            return None
+        i2c_rdwr(clear)
+        return (block[11] << 8) | block[12]
+
+    return read_mm, smbus.close
+
+
+def _irq_range_reader(bus: int, address: int, int_pin: int):
+    """Return (read_mm, close) where read_mm blocks until GPIO1 signals a sample.
+
+    Uses the libgpiod v1 bindings (python3-libgpiod) and the smbus2 fast read.
+    Raises ImportError if either is missing.
+    """
+    import gpiod
+    from smbus2 import SMBus
+
     with SMBus(bus) as smbus:
-        for addr in range(0x03, 0x78):
-            try:
-                smbus.write_quick(addr)
-                found.append(addr)
-            except OSError:
-                pass
-    return found
+        # GPIO1 = new sample ready; clear anything latched before listening.
+        smbus.write_byte_data(address, _SYSTEM_INTERRUPT_CONFIG_GPIO, 0x04)
+        smbus.write_byte_data(address, _SYSTEM_INTERRUPT_CLEAR, 0x01)
+    fast_read, close_bus = _fast_range_reader(bus, address)
 
+    # Pi 5 exposes the header on a different chip; GPIOCHIP is the chip number,
+    # the same variable motor_controller reads for the lgpio backend.
+    chip = gpiod.Chip(f"gpiochip{int(os.environ.get('GPIOCHIP', '0'))}")
+    line = chip.get_line(int_pin)
+    # GPIO1 is open-drain and active low: a new sample pulls it down until cleared.
+    line.request(
+        consumer="test_vl53l0x",
+        type=gpiod.LINE_REQ_EV_FALLING_EDGE,
+        flags=getattr(gpiod, "LINE_REQ_FLAG_BIAS_PULL_UP", 0),
+    )
 
-def _format_addr(addr: int) -> str:
-    return f"0x{addr:02X}"
+    def read_mm() -> int | None:
+        if line.event_wait(sec=1):
+            line.event_read()
+        # On timeout read anyway: clears a stuck-low GPIO1 and surfaces bus errors.
+        return fast_read()
 
+    def close() -> None:
+        line.release()
+        chip.close()
+        close_bus()
 
-def _init_sensor(address: int):
-    try:
-        import board
-        import busio
-        import adafruit_vl53l0x
-    except Exception as exc:
-        print(f"VL53L0X import error: {exc}")
+    return read_mm, close
+
+
+_FMT_ADDR = "0x{:02X}".format
+
+
+# Timing budget presets (ST API): a longer budget averages more returns for
+# better accuracy but caps the sample rate at roughly 1 / budget.
+_BUDGET_PROFILES_US = {
+    "high_speed": 20000,  # ~50 Hz, +/-5% accuracy
+    "balanced": 33000,  # ~30 Hz, sensor default
+    "high_accuracy": 200000,  # ~5 Hz, under +/-3% accuracy
+}
+
+
+def _init_sensor(address: int, i2c_hz: int = 400000):
+    if _IMPORT_ERR is not None:
+        print(f"VL53L0X import error: {_IMPORT_ERR}")
         raise RuntimeError(
             "Missing dependencies for VL53L0X driver.\n\n"
             "Install:\n"
             "  pip3 install adafruit-blinka adafruit-circuitpython-vl53l0x\n\n"
             "If I2C isn't enabled on the Pi:\n"
             "  sudo raspi-config  (Interface Options -> I2C)\n"
-        ) from exc
+        ) from _IMPORT_ERR
 
-    # Initialize I2C
-    i2c = busio.I2C(board.SCL, board.SDA)
-    # Wait for lock (some systems need a moment)
-    t0 = time.monotonic()
-    while not i2c.try_lock():
-        if time.monotonic() - t0 > 3.0:
-            raise RuntimeError("Timed out acquiring I2C lock. Is I2C enabled and not used by another process?")
-        time.sleep(0.01)
-    i2c.unlock()
+    # Initialize I2C. On the Pi the kernel's i2c_arm_baudrate dtparam sets the
+    # actual clock; the frequency here applies on boards where Blinka drives it.
+    try:
+        i2c = busio.I2C(board.SCL, board.SDA, frequency=i2c_hz)
+    except TypeError:  # older Blinka without the frequency kwarg
+        i2c = busio.I2C(board.SCL, board.SDA)
+    # Confirm the bus lock is free; contention is rare, so a few spaced
+    # attempts replace the old 10 ms polling spin.
+    for _ in range(3):
+        if i2c.try_lock():
+            i2c.unlock()
+            break
+        time.sleep(0.05)
+    else:
+        raise RuntimeError("Could not acquire I2C lock. Is I2C enabled and not used by another process?")
 
     # Create sensor; Adafruit driver supports address kwarg on most versions.
     try:
@@ -87,29 +237,152 @@ def _init_sensor(address: int):
     return sensor
 
 
+async def _reader(
+    q: asyncio.Queue,
+    exe: ThreadPoolExecutor,
+    read_mm,
+    period_s: float,
+    count: int | None = None,
+    samples=None,
+) -> int:
+    run_in_executor = asyncio.get_running_loop().run_in_executor
+    n = 0
+    consecutive_errors = 0
+    next_tick = time.monotonic()
+    while True:
+        t = time.monotonic()
+        try:
+            # The blocking I2C read runs off-loop so the writer can drain
+            # meanwhile. None: the sensor, whose ranging period drifts against
+            # ours, has no new sample yet; skip the tick rather than repeat one.
+            mm = await run_in_executor(exe, read_mm)
+            consecutive_errors = 0
+            if mm is not None:
+                q.put_nowait((t, mm))
+                if samples is not None:
+                    samples[n] = mm
+                n += 1
+                if n == count:
+                    return 0
+        except Exception as exc:
+            consecutive_errors += 1
+            q.put_nowait(f"{t:.3f}  read_error={type(exc).__name__}: {exc}\n")
+            if consecutive_errors >= 10:
+                q.put_nowait("Too many consecutive read errors; stopping.\n")
+                return 3
+
+        # Deadline pacing: sleep only what's left of this period, so read
+        # and print time don't stretch the loop below --hz.
+        next_tick += period_s
+        delay = next_tick - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        else:
+            next_tick = time.monotonic()  # fell behind; don't burst to catch up
+
+
+async def _writer(q: asyncio.Queue) -> None:
+    """Format queued samples and write them in batches until None."""
+    write = sys.stdout.write
+    buf: list[str] = []
+    last_write = time.monotonic()
+    try:
+        while True:
+            item = await q.get()
+            if item is None:
+                return
+            buf.append(_FMT(*item) if type(item) is tuple else item)
+            now = time.monotonic()
+            if len(buf) >= OUT_BATCH or now - last_write >= OUT_FLUSH_S:
+                write("".join(buf))
+                sys.stdout.flush()
+                buf.clear()
+                last_write = now
+    finally:
+        if buf:
+            write("".join(buf))
+
+
+async def _sample(read_mm, period_s: float, count: int | None = None, samples=None) -> int:
+    q: asyncio.Queue = asyncio.Queue()
+    # One dedicated worker: every read runs on the same thread, so bus access
+    # stays serialized and no executor threads are spun up on demand.
+    exe = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vl53l0x-read")
+    writer = asyncio.create_task(_writer(q))
+    try:
+        return await _reader(q, exe, read_mm, period_s, count, samples)
+    finally:
+        q.put_nowait(None)
+        await writer
+        exe.shutdown(wait=True)
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="VL53L0X I2C scan + distance read")
-    parser.add_argument("--bus", type=int, default=int(os.environ.get("I2C_BUS", "1")), help="I2C bus number (default: 1)")
+    parser.add_argument("--bus", type=int, default=None, help="I2C bus number (default: $I2C_BUS or 1)")
     parser.add_argument(
         "--address",
         type=lambda s: int(s, 0),
-        default=int(os.environ.get("VL53L0X_ADDR", "0x29"), 0),
-        help="I2C address (default: 0x29)",
+        default=None,
+        help="I2C address (default: $VL53L0X_ADDR or 0x29)",
     )
     parser.add_argument("--hz", type=float, default=10.0, help="Read rate in Hz (default: 10)")
+    parser.add_argument(
+        "--profile",
+        choices=sorted(_BUDGET_PROFILES_US),
+        default="balanced",
+        help="Timing budget preset: high_speed=20ms (~50 Hz, less accurate), "
+        "balanced=33ms (~30 Hz), high_accuracy=200ms (~5 Hz) (default: balanced)",
+    )
+    parser.add_argument(
+        "--budget-us",
+        type=int,
+        default=None,
+        help="Measurement timing budget in microseconds, overrides --profile (min 20000). "
+        "Shorter = faster sampling, noisier ranges.",
+    )
+    parser.add_argument(
+        "--i2c-hz",
+        type=int,
+        default=400000,
+        help="I2C bus clock in Hz (default: 400000, Fast Mode). On the Pi, also set "
+        "dtparam=i2c_arm_baudrate in /boot/config.txt.",
+    )
+    parser.add_argument(
+        "--int-pin",
+        type=int,
+        default=None,
+        help="BCM pin wired to the sensor's GPIO1; read each sample on its data-ready "
+        "interrupt instead of polling (ignores --hz; needs python3-libgpiod and smbus2)",
+    )
+    parser.add_argument("--count", type=int, default=None, help="Exit after N samples (default: run until Ctrl+C)")
+    parser.add_argument("--stats", action="store_true", help="With --count, print mean/std/min/max at the end (needs numpy)")
     parser.add_argument("--scan", action="store_true", help="Scan I2C and exit")
     args = parser.parse_args()
+    if args.count is not None and args.count < 1:
+        parser.error("--count must be at least 1")
+    if args.stats and args.count is None:
+        parser.error("--stats requires --count N")
+    if args.bus is None:
+        args.bus = int(os.environ.get("I2C_BUS", "1"))
+    if args.address is None:
+        args.address = int(os.environ.get("VL53L0X_ADDR", "0x29"), 0)
+    if args.budget_us is None:
+        args.budget_us = _BUDGET_PROFILES_US[args.profile]
+    elif args.budget_us < 20000:
+        parser.error("--budget-us must be at least 20000")
 
-    if platform.system().lower() == "windows":
+    if sys.platform == "win32":
         print("This script is meant to run on the Raspberry Pi (Linux) connected to the VL53L0X over I2C.")
         print("You can still edit it on Windows; run it on the Pi via SSH.")
 
     # Always do a quick scan first so you get an immediate "is it detected" signal.
     try:
-        addrs = _scan_i2c(args.bus)
-        print(f"I2C bus {args.bus} devices: {', '.join(_format_addr(a) for a in addrs) if addrs else '(none)'}")
+        # Only an explicit --scan needs the whole bus; otherwise stop at the sensor.
+        addrs = _scan_i2c(args.bus, target=None if args.scan else args.address)
+        print(f"I2C bus {args.bus} devices: {', '.join(_FMT_ADDR(a) for a in addrs) if addrs else '(none)'}")
         if args.address not in addrs:
-            print(f"Expected VL53L0X at {_format_addr(args.address)} was NOT found.")
+            print(f"Expected VL53L0X at {_FMT_ADDR(args.address)} was NOT found.")
             print("Check wiring (SDA/SCL swapped?), power, and that I2C is enabled.")
     except Exception as exc:
         print(f"I2C scan failed: {exc}")
@@ -120,34 +393,76 @@ def main() -> int:
     if args.scan:
         return 0
 
+    samples = None
+    if args.stats:
+        try:
+            import numpy as np
+        except ImportError:
+            print("--stats needs numpy: pip3 install numpy")
+            return 2
+        # Pre-sized typed buffer; ranges fit in 16 bits (8190 = out of range).
+        samples = np.empty(args.count, dtype=np.uint16)
+
     try:
-        sensor = _init_sensor(args.address)
+        if args.i2c_hz > 400000:
+            print(
+                f"Warning: --i2c-hz {args.i2c_hz} is above Fast Mode; make sure "
+                "dtparam=i2c_arm_baudrate=400000 (or higher) is set in /boot/config.txt."
+            )
+        sensor = _init_sensor(args.address, args.i2c_hz)
+        sensor.measurement_timing_budget = int(args.budget_us)
+        # Continuous mode: the sensor ranges back-to-back and latches each result,
+        # so a read after the budget has elapsed returns without waiting.
+        sensor.start_continuous()
     except Exception as exc:
         print(str(exc))
         return 2
 
-    period_s = 1.0 / max(0.5, float(args.hz))
-    print(f"Reading VL53L0X at {_format_addr(args.address)} ({args.hz:.1f} Hz). Ctrl+C to stop.")
+    budget_s = args.budget_us / 1_000_000
+    if args.int_pin is not None:
+        try:
+            read_mm, close_reader = _irq_range_reader(args.bus, args.address, args.int_pin)
+        except Exception as exc:
+            print(f"GPIO1 interrupt setup failed: {exc}")
+            print("Install on the Pi: sudo apt install -y python3-libgpiod && pip3 install smbus2")
+            sensor.stop_continuous()
+            return 2
+        # Each read blocks until the sensor's next sample; no pacing needed.
+        period_s = 0.0
+        rate = f"GPIO{args.int_pin} data-ready"
+    else:
+        try:
+            read_mm, close_reader = _fast_range_reader(args.bus, args.address)
+        except ImportError:
+            print("smbus2 not installed; using the driver's read path (pip3 install smbus2 for the fast path).")
+            read_mm, close_reader = (lambda: sensor.range), None
+        # Polling faster than the sensor produces samples would only hit empty ticks.
+        period_s = max(1.0 / max(0.5, float(args.hz)), budget_s)
+        rate = f"{1.0 / period_s:.1f} Hz"
+    print(
+        f"Reading VL53L0X at {_FMT_ADDR(args.address)} ({rate}, "
+        f"budget {args.budget_us} us). Ctrl+C to stop."
+    )
 
-    consecutive_errors = 0
     try:
-        while True:
-            t = time.time()
-            try:
-                mm = int(sensor.range)
-                consecutive_errors = 0
-                print(f"{t:.3f}  range_mm={mm}")
-            except Exception as exc:
-                consecutive_errors += 1
-                print(f"{t:.3f}  read_error={type(exc).__name__}: {exc}")
-                if consecutive_errors >= 10:
-                    print("Too many consecutive read errors; stopping.")
-                    return 3
-
-            time.sleep(period_s)
+        rc = asyncio.run(_sample(read_mm, period_s, args.count, samples))
+        if rc == 0 and samples is not None:
+            print(
+                f"n={samples.size} mean={samples.mean():.1f} std={samples.std():.2f} "
+                f"min={samples.min()} max={samples.max()}"
+            )
+        return rc
     except KeyboardInterrupt:
         print("\nStopped.")
         return 0
+    finally:
+        sys.stdout.flush()
+        if close_reader is not None:
+            close_reader()
+        try:
+            sensor.stop_continuous()
+        except Exception:
+            pass
 
 
 if __name__ == "__main__":